@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import logging
 import os
+import sys
 from collections import OrderedDict
 from typing import Iterable, Mapping
 
@@ -25,7 +26,7 @@ def build_hit(
     hit_config: str | Mapping = None,
     lh5_tables: Iterable[str] = None,
     lh5_tables_config: str | Mapping[str, Mapping] = None,
-    n_max: int = np.inf,
+    n_max: int = sys.maxsize,
     wo_mode: str = "write_safe",
     buffer_len: int = 3200,
 ) -> None:
@@ -74,7 +75,7 @@ def build_hit(
         configuration blocks or to JSON files containing them. This option is
         mutually exclusive with `hit_config` and `lh5_tables`.
     n_max
-        maximum number of rows to process
+        maximum number of rows to process in each table.
     wo_mode
         forwarded to :meth:`lgdo.lh5.write`.
 
@@ -133,7 +134,7 @@ def build_hit(
 
     wo_current = wo_mode
     for tbl, cfg in lh5_tables_config.items():
-        lh5_it = LH5Iterator(infile, tbl, buffer_len=buffer_len)
+        lh5_it = LH5Iterator(infile, tbl, buffer_len=buffer_len, n_entries=n_max)
         write_offset = 0
 
         log.info(f"Processing table '{tbl}' in file {infile}")
@@ -171,8 +172,11 @@ def build_hit(
                     else:
                         flag_dtype = np.uint64
 
-                    df_flags = outtbl_obj.view_as("pd", cols=flags_list)
-                    flag_values = df_flags.values.astype(flag_dtype)
+                    # copy the flag columns straight into one array, there
+                    # is no need to build a DataFrame around them
+                    flag_values = np.column_stack(
+                        [outtbl_obj[flag].nda for flag in flags_list]
+                    ).astype(flag_dtype, copy=False)
 
                     multiplier = 2 ** np.arange(n_flags, dtype=flag_values.dtype)
                     flag_out = np.dot(flag_values, multiplier)
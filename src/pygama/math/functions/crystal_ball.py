@@ -2,6 +2,7 @@
 Crystal ball distributions for Pygama
 """
 
+import math
 from math import erf
 
 import numba as nb
@@ -9,10 +10,129 @@ import numpy as np
 
 from pygama.math.functions.pygama_continuous import PygamaContinuous
 from pygama.utils import numba_math_defaults as nb_defaults
-from pygama.utils import numba_math_defaults_kwargs as nb_kwargs
 
 
-@nb.njit(**nb_kwargs)
+@nb.njit(**nb_defaults(parallel=False))
+def _crystal_ball_constants(
+    beta: float, m: float
+) -> tuple[float, float, float, float, float]:
+    r"""
+    Return the constants :math:`A`, :math:`B`, the normalization :math:`n`,
+    :math:`\text{erf}(\beta/\sqrt{2})` and the value of the CDF at the
+    transition point of the crystal ball. They only depend on the shape
+    parameters, so the kernels work them out once per call rather than per
+    sample.
+    """
+
+    if (beta <= 0) or (m <= 1):
+        raise ValueError("beta must be greater than 0, and m must be greater than 1")
+
+    const_a = (m / beta) ** m * math.exp(-(beta**2) / 2.0)
+    const_b = m / beta - beta
+    erf_beta = erf(beta / math.sqrt(2.0))
+    n = 1.0 / (
+        m / beta / (m - 1) * math.exp(-(beta**2) / 2.0)
+        + math.sqrt(math.pi / 2) * (1 + erf_beta)
+    )
+    cdf_beta = n * const_a * (const_b + beta) ** (1 - m) / (m - 1)
+    return const_a, const_b, n, erf_beta, cdf_beta
+
+
+# fastmath assumes no infinities, which would turn an infinite fit range edge into nan
+@nb.njit(**nb_defaults(parallel=False, fastmath=False))
+def _crystal_ball_cdf_scalar(
+    x: float,
+    mu: float,
+    sigma: float,
+    beta: float,
+    m: float,
+    const_a: float,
+    const_b: float,
+    n: float,
+    erf_beta: float,
+    cdf_beta: float,
+) -> float:
+    r"""
+    CDF of the crystal ball at a single point, given the constants from
+    :func:`_crystal_ball_constants`. Avoids allocating arrays when only the
+    CDF at the fit range edges is needed, which may be infinite.
+    """
+
+    z = (x - mu) / sigma
+    if z <= -1 * beta:
+        return n * const_a * math.exp((1 - m) * math.log(const_b - z)) / (m - 1)
+    return cdf_beta + n * math.sqrt(math.pi / 2) * (erf_beta + erf(z / math.sqrt(2.0)))
+
+
+@nb.njit(**nb_defaults(error_model="numpy", boundscheck=False))
+def _crystal_ball_pdf_kernel(
+    x: np.ndarray,
+    mu: float,
+    sigma: float,
+    beta: float,
+    m: float,
+    scale: float,
+) -> np.ndarray:
+    r"""
+    Single pass over `x` for the crystal ball PDF scaled by `scale`, with the
+    constants from :func:`_crystal_ball_constants`.
+    """
+
+    const_a, const_b, n, _, _ = _crystal_ball_constants(beta, m)
+    inv_sigma = 1.0 / sigma
+    neg_beta = -1 * beta
+    neg_m = -1 * m
+    tail_norm = scale * n * const_a * inv_sigma
+    gauss_norm = scale * n * inv_sigma
+
+    y = np.empty_like(x, dtype=np.float64)
+    for i in nb.prange(x.shape[0]):
+        z = (x[i] - mu) * inv_sigma
+        # m is fixed for the whole call, so raise to it via exp/log of the base
+        if z <= neg_beta:
+            y[i] = tail_norm * math.exp(neg_m * math.log(const_b - z))
+        else:
+            y[i] = gauss_norm * math.exp(-0.5 * z * z)
+
+    return y
+
+
+@nb.njit(**nb_defaults(error_model="numpy", boundscheck=False))
+def _crystal_ball_cdf_kernel(
+    x: np.ndarray,
+    mu: float,
+    sigma: float,
+    beta: float,
+    m: float,
+    scale: float,
+) -> np.ndarray:
+    r"""
+    Single pass over `x` for the crystal ball CDF scaled by `scale`, with the
+    constants from :func:`_crystal_ball_constants`.
+    """
+
+    const_a, const_b, n, erf_beta, cdf_beta = _crystal_ball_constants(beta, m)
+    inv_sigma = 1.0 / sigma
+    inv_sqrt2 = 1.0 / math.sqrt(2.0)
+    neg_beta = -1 * beta
+    one_m_m = 1 - m
+    tail_norm = scale * n * const_a / (m - 1)
+    # the Gaussian side is an affine function of erf
+    gauss_norm = scale * n * math.sqrt(math.pi / 2)
+    gauss_offset = scale * cdf_beta + gauss_norm * erf_beta
+
+    y = np.empty_like(x, dtype=np.float64)
+    for i in nb.prange(x.shape[0]):
+        z = (x[i] - mu) * inv_sigma
+        if z <= neg_beta:
+            y[i] = tail_norm * math.exp(one_m_m * math.log(const_b - z))
+        else:
+            y[i] = gauss_offset + gauss_norm * erf(z * inv_sqrt2)
+
+    return y
+
+
+@nb.njit(**nb_defaults())
 def nb_crystal_ball_pdf(
     x: np.ndarray, mu: float, sigma: float, beta: float, m: float
 ) -> np.ndarray:
@@ -33,8 +153,8 @@ def nb_crystal_ball_pdf(
         n =  \frac{1}{\sigma \frac{m e^{-\beta^2/2}}{\beta(m-1)} + \sigma \sqrt{\frac{\pi}{2}}\left(1+\text{erf}\left(\frac{\beta}{\sqrt{2}}\right)\right)}
 
 
-    As a Numba vectorized function, it runs slightly faster than
-    'out of the box' functions.
+    The shape constants are computed once per call and the Numba kernel reads
+    and writes each sample once.
 
     Parameters
     ----------
@@ -50,33 +170,10 @@ def nb_crystal_ball_pdf(
         The power of the power-law tail
     """
 
-    if (beta <= 0) or (m <= 1):
-        raise ValueError("beta must be greater than 0, and m must be greater than 1")
-
-    # Define some constants to calculate the function
-    const_a = (m / np.abs(beta)) ** m * np.exp(-1 * beta**2 / 2.0)
-    const_b = m / np.abs(beta) - np.abs(beta)
-
-    n = 1.0 / (
-        m / np.abs(beta) / (m - 1) * np.exp(-(beta**2) / 2.0)
-        + np.sqrt(np.pi / 2) * (1 + erf(np.abs(beta) / np.sqrt(2.0)))
-    )
-
-    y = np.empty_like(x, dtype=np.float64)
-    for i in nb.prange(x.shape[0]):
-        # Shift the distribution
-        y[i] = (x[i] - mu) / sigma
-        # Check if it is powerlaw
-        if y[i] <= -1 * beta:
-            y[i] = n * const_a * (const_b - y[i]) ** (-1 * m) / sigma
-        # If it isn't power law, then it Gaussian
-        else:
-            y[i] = n * np.exp(-1 * y[i] ** 2 / 2) / sigma
-
-    return y
+    return _crystal_ball_pdf_kernel(x, mu, sigma, beta, m, 1.0)
 
 
-@nb.njit(**nb_kwargs)
+@nb.njit(**nb_defaults())
 def nb_crystal_ball_cdf(
     x: np.ndarray, mu: float, sigma: float, beta: float, m: float
 ) -> np.ndarray:
@@ -97,8 +194,8 @@ def nb_crystal_ball_cdf(
         n =  \frac{1}{\sigma \frac{m e^{-\beta^2/2}}{\beta(m-1)} + \sigma \sqrt{\frac{\pi}{2}}\left(1+\text{erf}\left(\frac{\beta}{\sqrt{2}}\right)\right)}
 
 
-    As a Numba vectorized function, it runs slightly faster than
-    'out of the box' functions.
+    The shape constants are computed once per call and the Numba kernel reads
+    and writes each sample once.
 
     Parameters
     ----------
@@ -114,43 +211,17 @@ def nb_crystal_ball_cdf(
         The power of the power-law tail
     """
 
-    if (beta <= 0) or (m <= 1):
-        raise ValueError("beta must be greater than 0, and m must be greater than 1")
-    # Define some constants to calculate the function
-    const_a = (m / np.abs(beta)) ** m * np.exp(-1 * beta**2 / 2.0)
-    const_b = m / np.abs(beta) - np.abs(beta)
-
-    # Calculate the normalization constant
-    n = 1.0 / (
-        (np.sqrt(np.pi / 2) * (erf(beta / np.sqrt(2)) + 1))
-        + ((const_a * (const_b + beta) ** (1 - m)) / (m - 1))
-    )
-
-    y = np.empty_like(x, dtype=np.float64)
-
-    # Check if it is in the power law part
-    for i in nb.prange(x.shape[0]):
-        # Shift the distribution
-        y[i] = (x[i] - mu) / sigma
-        if y[i] <= -1 * beta:
-            y[i] = n * const_a * ((const_b - y[i]) ** (1 - m)) / (m - 1)
-
-        # If it isn't in the power law, then it is Gaussian
-        else:
-            y[i] = const_a * n * ((const_b + beta) ** (1 - m)) / (m - 1) + n * np.sqrt(
-                np.pi / 2
-            ) * (erf(beta / np.sqrt(2)) + erf(y[i] / np.sqrt(2)))
-    return y
+    return _crystal_ball_cdf_kernel(x, mu, sigma, beta, m, 1.0)
 
 
-@nb.njit(**nb_defaults(parallel=False))
+@nb.njit(**nb_defaults())
 def nb_crystal_ball_scaled_pdf(
     x: np.ndarray, area: float, mu: float, sigma: float, beta: float, m: float
 ) -> np.ndarray:
     r"""
     Scaled PDF of a power-law tail plus gaussian.
-    As a Numba vectorized function, it runs slightly faster than
-    'out of the box' functions.
+    The shape constants are computed once per call and the Numba kernel reads
+    and writes each sample once.
 
     Parameters
     ----------
@@ -168,17 +239,17 @@ def nb_crystal_ball_scaled_pdf(
         The power of the power-law tail
     """
 
-    return area * nb_crystal_ball_pdf(x, mu, sigma, beta, m)
+    return _crystal_ball_pdf_kernel(x, mu, sigma, beta, m, area)
 
 
-@nb.njit(**nb_defaults(parallel=False))
+@nb.njit(**nb_defaults())
 def nb_crystal_ball_scaled_cdf(
     x: np.ndarray, area: float, mu: float, sigma: float, beta: float, m: float
 ) -> np.ndarray:
     r"""
     Scaled CDF for power-law tail plus gaussian. Used for extended binned fits.
-    As a Numba vectorized function, it runs slightly faster than
-    'out of the box' functions.
+    The shape constants are computed once per call and the Numba kernel reads
+    and writes each sample once.
 
     Parameters
     ----------
@@ -196,7 +267,7 @@ def nb_crystal_ball_scaled_cdf(
         The power of the power-law tail
     """
 
-    return area * nb_crystal_ball_cdf(x, mu, sigma, beta, m)
+    return _crystal_ball_cdf_kernel(x, mu, sigma, beta, m, area)
 
 
 class CrystalBallGen(PygamaContinuous):
@@ -263,9 +334,10 @@ class CrystalBallGen(PygamaContinuous):
         beta: float,
         m: float,
     ) -> np.ndarray:
-        return np.diff(
-            nb_crystal_ball_scaled_cdf(np.array([x_lo, x_hi]), area, mu, sigma, beta, m)
-        )[0], nb_crystal_ball_scaled_pdf(x, area, mu, sigma, beta, m)
+        consts = _crystal_ball_constants(beta, m)
+        lo = _crystal_ball_cdf_scalar(x_lo, mu, sigma, beta, m, *consts)
+        hi = _crystal_ball_cdf_scalar(x_hi, mu, sigma, beta, m, *consts)
+        return area * (hi - lo), nb_crystal_ball_scaled_pdf(x, area, mu, sigma, beta, m)
 
     def cdf_ext(
         self, x: np.ndarray, area: float, mu: float, sigma: float, beta: float, m: float
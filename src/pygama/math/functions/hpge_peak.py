@@ -171,7 +171,7 @@ def hpge_get_fwfm(
 
     else:
         if cov is None:
-            return pars[sigma_idx] * 2 * np.sqrt(2 * np.log(2))
+            return pars[sigma_idx] * 2 * np.sqrt(-2 * np.log(frac_max))
         else:
             return pars[sigma_idx] * 2 * np.sqrt(-2 * np.log(frac_max)), np.sqrt(
                 cov[sigma_idx][sigma_idx]
@@ -1017,19 +1017,19 @@ def tag_pulsers(df, chan_info, window=0.01):
 
     if isinstance(chan_info, tuple):
         chan_info = [chan_info]
-    final_mask = None
+    timestamps = df.timestamp.to_numpy()
+    final_mask = np.zeros(len(df), dtype=bool)
     for chan_i in chan_info:
         pulser_energy, peak_e_err, period, energy_name = chan_i
 
-        e_cut = (df[energy_name] < pulser_energy + peak_e_err) & (
-            df[energy_name] > pulser_energy - peak_e_err
+        energies = df[energy_name].to_numpy()
+        e_cut = (energies < pulser_energy + peak_e_err) & (
+            energies > pulser_energy - peak_e_err
         )
-        df_pulser = df[e_cut]
+        pulser_ts = timestamps[e_cut]
 
-        time_since_last = np.zeros(len(df_pulser))
-        time_since_last[1:] = (
-            df_pulser.timestamp.values[1:] - df_pulser.timestamp.values[:-1]
-        )
+        time_since_last = np.zeros(len(pulser_ts))
+        time_since_last[1:] = pulser_ts[1:] - pulser_ts[:-1]
 
         mode_idxs = (time_since_last > period - window) & (
             time_since_last < period + window
@@ -1039,9 +1039,8 @@ def tag_pulsers(df, chan_info, window=0.01):
         # print(f"pulser events: {pulser_events}")
         if pulser_events < 3:
             return df
-        df_pulser = df_pulser[mode_idxs]
 
-        ts = df_pulser.timestamp.values
+        ts = pulser_ts[mode_idxs]
         diff_zero = np.zeros(len(ts))
         diff_zero[1:] = np.around(np.divide(np.subtract(ts[1:], ts[:-1]), period))
         diff_cum = np.cumsum(diff_zero)
@@ -1049,14 +1048,11 @@ def tag_pulsers(df, chan_info, window=0.01):
 
         period = z[0]
         phase = z[1]
-        mod = np.abs(df.timestamp - phase) % period
+        mod = np.abs(timestamps - phase) % period
 
         period_cut = (mod < 0.1) | ((period - mod) < 0.1)  # 0.1)
 
-        if final_mask is None:
-            final_mask = e_cut & period_cut
-        else:
-            final_mask = final_mask | (e_cut & period_cut)
+        final_mask |= e_cut & period_cut
 
     df.loc[final_mask, "isPulser"] = 1
 
@@ -57,7 +57,7 @@ def dplms_ge_dict(
     out_dict
     """
 
-    t0 = time.time()
+    t0 = time.perf_counter()
     log.info("Selecting baselines")
 
     dsp_fft = run_one_dsp(raw_fft, dsp_config, db_dict=par_dsp)
@@ -80,7 +80,7 @@ def dplms_ge_dict(
     bls_cut_pars = [par for par in dplms_dict["bls_cut_pars"]]
     for par in bls_cut_pars:
         bls_par[par] = dsp_fft[dplms_dict["bls_cut_pars"][par]["cut_parameter"]].nda
-    t1 = time.time()
+    t1 = time.perf_counter()
     log.info(
         f"total events {len(raw_fft)}, {len(bls)} baseline selected in {(t1-t0):.2f} s"
     )
@@ -89,7 +89,7 @@ def dplms_ge_dict(
     )
 
     nmat = noise_matrix(bls, dplms_dict["length"])
-    t2 = time.time()
+    t2 = time.perf_counter()
     log.info(f"Time to calculate noise matrix {(t2-t1):.2f} s")
 
     log.info("Selecting signals")
@@ -100,7 +100,7 @@ def dplms_ge_dict(
 
     log.info(f"Produce dsp data for {len(raw_cal)} events")
     dsp_cal = run_one_dsp(raw_cal, dsp_config, db_dict=par_dsp)
-    t3 = time.time()
+    t3 = time.perf_counter()
     log.info(f"Time to run dsp production {(t3-t2):.2f} s")
 
     dsp_config["outputs"] = [ene_par, ctc_par]
@@ -142,7 +142,7 @@ def dplms_ge_dict(
 
         ref, rmat, pmat, fmat = signal_matrices(wfs, dplms_dict["length"], decay_const)
 
-        t_tmp = time.time()
+        t_tmp = time.perf_counter()
         nm_coeff = coeff_values["nm"]
         za_coeff = coeff_values["za"]
         pl_coeff = coeff_values["pl"]
@@ -159,10 +159,10 @@ def dplms_ge_dict(
         )
         par_dsp["dplms"] = {"length": dplms_dict["length"], "coefficients": x}
         log.info(
-            f"Filter synthesis in {time.time()-t_tmp:.1f} s, filter area {np.sum(x)}"
+            f"Filter synthesis in {time.perf_counter()-t_tmp:.1f} s, filter area {np.sum(x)}"
         )
 
-        t_tmp = time.time()
+        t_tmp = time.perf_counter()
         dsp_opt = run_one_dsp(raw_cal, dsp_config, db_dict=par_dsp)
 
         try:
@@ -185,7 +185,7 @@ def dplms_ge_dict(
         )
         p_val = chi2.sf(chisquare[0], chisquare[1])
         log.info(
-            f"FWHM = {fwhm:.2f} ± {fwhm_err:.2f} keV, p_val={p_val} evaluated in {time.time()-t_tmp:.1f} s"
+            f"FWHM = {fwhm:.2f} ± {fwhm_err:.2f} keV, p_val={p_val} evaluated in {time.perf_counter()-t_tmp:.1f} s"
         )
         grid_dict[i]["fwhm"] = fwhm
         grid_dict[i]["fwhm_err"] = fwhm_err
@@ -279,7 +279,7 @@ def dplms_ge_dict(
     }
     out_dict.update({"ctc_params": out_alpha_dict})
 
-    log.info(f"Time to complete DPLMS filter synthesis {time.time()-t0:.1f}")
+    log.info(f"Time to complete DPLMS filter synthesis {time.perf_counter()-t0:.1f}")
 
     if display > 0:
         plot_dict = {"ref": ref, "coefficients": x}
@@ -1951,8 +1951,9 @@ def get_hpge_energy_peak_par_guess(
             sigma_guess = pars[1]
             height = pars[2]
         # get bg and step from edges of hist
-        bg = np.mean(hist[-10:])
-        step = bg - np.mean(hist[:10])
+        bg_left = hist[:10].mean()
+        bg = hist[-10:].mean()
+        step = bg - bg_left
         # get sigma from fwfm with f = 1/sqrt(e)
         try:
             sigma = pgh.get_fwfm(
@@ -2031,7 +2032,7 @@ def get_hpge_energy_peak_par_guess(
             parguess["b"] = 1
 
         elif func == pgf.gauss_on_step or func == pgf.hpge_peak:
-            hstep = step / (bg + np.mean(hist[:10]))
+            hstep = step / (bg + bg_left)
             parguess["hstep"] = hstep
 
             if func == pgf.hpge_peak:
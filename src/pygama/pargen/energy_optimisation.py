@@ -6,14 +6,18 @@ to provide the best energy resolution at Qbb
 """
 
 import logging
+import multiprocessing
+import sys
 
 import matplotlib.pyplot as plt
+import numba as nb
 import numpy as np
 
 import pygama.math.distributions as pgd
 import pygama.math.histogram as pgh
 import pygama.pargen.energy_cal as pgc
 from pygama.pargen.utils import convert_to_minuit, return_nans
+from pygama.utils import numba_math_defaults as nb_defaults
 
 log = logging.getLogger(__name__)
 
@@ -28,9 +32,7 @@ def simple_guess(energy, func, fit_range=None, bin_width=None):
     energy = energy[(energy >= fit_range[0]) & (energy <= fit_range[1])]
     if bin_width is None:
         init_bin_width = (
-            2
-            * (np.nanpercentile(energy, 75) - np.nanpercentile(energy, 25))
-            * len(energy) ** (-1 / 3)
+            2 * np.diff(np.percentile(energy, [25, 75]))[0] * len(energy) ** (-1 / 3)
         )
         init_hist, init_bins, _ = pgh.get_hist(
             energy, dx=init_bin_width, range=fit_range
@@ -47,18 +49,16 @@ def simple_guess(energy, func, fit_range=None, bin_width=None):
                 init_sigma = np.nanstd(energy)
         bin_width = (init_sigma) * len(energy) ** (-1 / 3)
 
-    hist, bins, var = pgh.get_hist(energy, dx=bin_width, range=fit_range)
-
     # make binning dynamic based on max, % of events/ n of events?
     hist, bins, var = pgh.get_hist(energy, range=fit_range, dx=bin_width)
 
     if func == pgd.hpge_peak or func == pgd.gauss_on_step:
         mu, sigma, amp = pgh.get_gaussian_guess(hist, bins)
         i_0 = np.argmax(hist)
-        bg = np.mean(hist[-10:])
-        step = bg - np.mean(hist[:10])
-        hstep = step / (bg + np.mean(hist[:10]))
-        dx = np.diff(bins)[0]
+        bg_left = hist[:10].mean()
+        bg_right = hist[-10:].mean()
+        hstep = (bg_right - bg_left) / (bg_right + bg_left)
+        dx = bins[1] - bins[0]
         n_bins_range = int((4 * sigma) // dx)
         nsig = np.sum(hist[i_0 - n_bins_range : i_0 + n_bins_range])
         nbkg = np.sum(hist) - nsig
@@ -86,6 +86,57 @@ def simple_guess(energy, func, fit_range=None, bin_width=None):
     return convert_to_minuit(parguess, func).values
 
 
+def _bootstrap_fwfm(func, par_b, frac_max):
+    """
+    Evaluates the fwfm for each set of bootstrapped parameters (rows of `par_b`).
+    Analytic fwfms (e.g. ``gauss_on_step``) are evaluated on all rows at once,
+    an exgauss on a step (e.g. ``hpge_peak``) needs a root finding per row so is
+    looped over, following the same check as ``hpge_get_fwfm``.
+    """
+    req_args = func.required_args()
+    if not (("htail" in req_args) and ("hstep" in req_args)):
+        return np.asarray(func.get_fwfm(par_b.T, frac_max=frac_max), dtype="float64")
+
+    y_b = np.zeros(len(par_b))
+    for i, p in enumerate(par_b):
+        try:
+            y_b[i] = func.get_fwfm(p, frac_max=frac_max)
+        except Exception:
+            y_b[i] = np.nan
+    return y_b
+
+
+@nb.njit(**nb_defaults(parallel=False, fastmath=False, cache=True))
+def _prep_ct_energy(
+    energies: np.ndarray, dt: np.ndarray, alpha: float, bin_width: float
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Applies the drift time correction and histograms the corrected energies
+    in whole bins of `bin_width`, skipping nans. Returns the corrected
+    energies, the counts and the index of the first bin (i.e. the lower edge
+    over `bin_width`). fastmath is off as it would drop the nan checks.
+    """
+    n = len(energies)
+    ct_energy = np.empty(n, dtype=np.float64)
+    lo = np.inf
+    hi = -np.inf
+    for i in range(n):
+        ct = alpha * dt[i] * energies[i] + energies[i]
+        ct_energy[i] = ct
+        # comparisons with nan are false, so nans never set the range
+        if ct < lo:
+            lo = ct
+        if ct > hi:
+            hi = ct
+
+    lower_bin = int(np.floor(lo / bin_width))
+    hist = np.zeros(int(np.floor(hi / bin_width)) + 1 - lower_bin, dtype=np.int64)
+    for i in range(n):
+        if not np.isnan(ct_energy[i]):
+            hist[int(np.floor(ct_energy[i] / bin_width)) - lower_bin] += 1
+    return ct_energy, hist, lower_bin
+
+
 def get_peak_fwhm_with_dt_corr(
     energies,
     alpha,
@@ -105,17 +156,11 @@ def get_peak_fwhm_with_dt_corr(
     along with the number of signal events and the reduced chi square of the fit. Can return result in ADC or keV.
     """
 
-    correction = np.multiply(
-        np.multiply(alpha, dt, dtype="float64"), energies, dtype="float64"
-    )
-    ct_energy = np.add(correction, energies)
-
-    lower_bound = (np.nanmin(ct_energy) // bin_width) * bin_width
-    upper_bound = ((np.nanmax(ct_energy) // bin_width) + 1) * bin_width
-    hist, bins, var = pgh.get_hist(
-        ct_energy, dx=bin_width, range=(lower_bound, upper_bound)
-    )
-    mu = bins[np.nanargmax(hist)]
+    energies = np.asarray(energies, dtype=np.float64)
+    dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), energies.shape)
+    ct_energy, hist, lower_bin = _prep_ct_energy(energies, dt, alpha, bin_width)
+    bins = np.arange(lower_bin, lower_bin + len(hist) + 1) * bin_width
+    mu = bins[np.argmax(hist)]
     adc_to_kev = mu / peak
     # Making the window slightly smaller removes effects where as mu moves edge can be outside bin width
     lower_bound = mu - ((kev_width[0] - 2) * adc_to_kev)
@@ -164,15 +209,14 @@ def get_peak_fwhm_with_dt_corr(
         rng = np.random.default_rng(1)
         # generate set of bootstrapped parameters
         par_b = rng.multivariate_normal(energy_pars, cov, size=100)
-        y_max = np.array([func.get_pdf(xs, *p) for p in par_b])
+        # the distributions do not broadcast over parameter sets, so evaluate
+        # each one straight into its row of a preallocated buffer
+        y_max = np.empty((len(par_b), len(xs)))
+        for i, p in enumerate(par_b):
+            y_max[i] = func.get_pdf(xs, *p)
         maxs = np.nanmax(y_max, axis=1)
 
-        y_b = np.zeros(len(par_b))
-        for i, p in enumerate(par_b):
-            try:
-                y_b[i] = func.get_fwfm(p, frac_max=frac_max)
-            except Exception:
-                y_b[i] = np.nan
+        y_b = _bootstrap_fwfm(func, par_b, frac_max)
         fwhm_err = np.nanstd(y_b, axis=0)
         fwhm_o_max_err = np.nanstd(y_b / maxs, axis=0)
 
@@ -185,10 +229,7 @@ def get_peak_fwhm_with_dt_corr(
 
         if display > 0:
             plt.figure()
-            hist, bins, var = pgh.get_hist(
-                ct_energy, dx=bin_width, range=(lower_bound, upper_bound)
-            )
-            plt.step(pgh.get_bin_centers(bins), hist)
+            plt.step(pgh.get_bin_centers(fit_bins), fit_hist)
             plt.plot(xs, y, color="orange")
             yerr_boot = np.nanstd(y_max, axis=0)
             plt.fill_between(
@@ -228,17 +269,63 @@ def get_peak_fwhm_with_dt_corr(
     )
 
 
+def _alpha_sweep_point(alpha, energies, dt, func, peak, kev_width):
+    """
+    Fits the peak for a single alpha of the sweep, returns the fwhm/max and its error
+    """
+    res = get_peak_fwhm_with_dt_corr(
+        energies,
+        alpha,
+        dt,
+        func,
+        peak,
+        kev_width,
+        guess=None,
+        frac_max=0.5,
+        allow_tail_drop=False,
+    )
+    return res[1], res[3]
+
+
+# data shared with the alpha sweep worker processes, inherited on fork so the
+# arrays and the distribution are never pickled
+_alpha_sweep_data = ()
+
+
+def _init_alpha_sweep_worker(*args):
+    global _alpha_sweep_data
+    _alpha_sweep_data = args
+
+
+def _alpha_sweep_worker(alpha):
+    return _alpha_sweep_point(alpha, *_alpha_sweep_data)
+
+
 def fom_fwhm_with_alpha_fit(
-    tb_in, kwarg_dict, ctc_parameter, nsteps=11, idxs=None, frac_max=0.2, display=0
+    tb_in,
+    kwarg_dict,
+    ctc_parameter,
+    nsteps=11,
+    idxs=None,
+    frac_max=0.2,
+    display=0,
+    n_processes=1,
 ):
     """
     FOM for sweeping over ctc values to find the best value, returns the best found fwhm with its error,
-    the corresponding alpha value and the number of events in the fitted peak, also the reduced chisquare of the
+    the corresponding alpha value and the number of events in the fitted peak, also the chisquare and
+    degrees of freedom of the final fit at the best alpha.
+
+    `n_processes` sets the number of worker processes used for the sweep. With the
+    default of 1 the alphas are fitted one after the other and the sweep stops early
+    once the fwhm starts increasing. If it is larger than 1, the fits are run in
+    forked worker processes, which skip the early stop and evaluate every alpha; the
+    early stop only truncates the collected results afterwards. Where forking is not
+    available or safe (Windows, macOS) the sweep runs serially.
     """
     parameter = kwarg_dict["parameter"]
     func = kwarg_dict["func"]
-    energies = tb_in[parameter].nda
-    energies = energies.astype("float64")
+    energies = np.asarray(tb_in[parameter].nda, dtype=np.float64)
     peak = kwarg_dict["peak"]
     kev_width = kwarg_dict["kev_width"]
     bin_width = kwarg_dict.get("bin_width", 1)
@@ -248,67 +335,72 @@ def fom_fwhm_with_alpha_fit(
     try:
         dt = tb_in[ctc_parameter].nda
     except KeyError:
-        dt = tb_in.eval(ctc_parameter)
+        dt = tb_in.eval(ctc_parameter).nda
+    dt = np.asarray(dt, dtype=np.float64)
     if idxs is not None:
         energies = energies[idxs]
         dt = dt[idxs]
     try:
-        if np.isnan(energies).any():
-            log.debug("nan in energies")
+        # a single reduction, nan or inf anywhere makes the sum non-finite
+        if not np.isfinite(energies.sum()):
+            log.debug("nan or inf in energies")
             raise RuntimeError
-        if np.isnan(dt).any():
-            log.debug("nan in dts")
+        if not np.isfinite(dt.sum()):
+            log.debug("nan or inf in dts")
             raise RuntimeError
-        fwhms = np.array([])
-        final_alphas = np.array([])
-        fwhm_errs = np.array([])
+        fwhms = np.full(nsteps, np.nan)
+        final_alphas = np.full(nsteps, np.nan)
+        fwhm_errs = np.full(nsteps, np.nan)
+        n_fits = 0
         best_fwhm = np.inf
         early_break = False
-        for alpha in alphas:
-            (
-                _,
-                fwhm_o_max,
-                _,
-                fwhm_o_max_err,
-                _,
-                _,
-                _,
-                _,
-                _,
-                fit_pars,
-            ) = get_peak_fwhm_with_dt_corr(
-                energies,
-                alpha,
-                dt,
-                func,
-                peak,
-                kev_width,
-                guess=None,
-                frac_max=0.5,
-                allow_tail_drop=False,
+        # fork is missing on Windows and unsafe on macOS
+        if n_processes > 1 and (
+            sys.platform == "darwin"
+            or "fork" not in multiprocessing.get_all_start_methods()
+        ):
+            log.warning("fork start method not available, running alpha sweep serially")
+            n_processes = 1
+        if n_processes > 1:
+            with multiprocessing.get_context("fork").Pool(
+                n_processes,
+                initializer=_init_alpha_sweep_worker,
+                initargs=(energies, dt, func, peak, kev_width),
+            ) as pool:
+                sweep = pool.map(_alpha_sweep_worker, alphas)
+        else:
+            sweep = (
+                _alpha_sweep_point(alpha, energies, dt, func, peak, kev_width)
+                for alpha in alphas
             )
+        for alpha, (fwhm_o_max, fwhm_o_max_err) in zip(alphas, sweep):
             if not np.isnan(fwhm_o_max):
-                fwhms = np.append(fwhms, fwhm_o_max)
-                final_alphas = np.append(final_alphas, alpha)
-                fwhm_errs = np.append(fwhm_errs, fwhm_o_max_err)
-                if fwhms[-1] < best_fwhm:
-                    best_fwhm = fwhms[-1]
+                fwhms[n_fits] = fwhm_o_max
+                final_alphas[n_fits] = alpha
+                fwhm_errs[n_fits] = fwhm_o_max_err
+                n_fits += 1
+                if fwhm_o_max < best_fwhm:
+                    best_fwhm = fwhm_o_max
             log.info(f"alpha: {alpha}, fwhm/max:{fwhm_o_max:.4f}+-{fwhm_o_max_err:.4f}")
 
-            ids = (fwhm_errs < 2 * np.nanpercentile(fwhm_errs, 50)) & (
-                fwhm_errs > 1e-10
-            )
-            if len(fwhms[ids]) > 5:
-                if (np.diff(fwhms[ids])[-3:] > 0).all():
+            errs = fwhm_errs[:n_fits]
+            ids = (errs < 2 * np.nanmedian(errs)) & (errs > 1e-10)
+            if len(fwhms[:n_fits][ids]) > 5:
+                if (np.diff(fwhms[:n_fits][ids])[-3:] > 0).all():
                     early_break = True
                     break
 
+        # drop the unused preallocated entries
+        fwhms = fwhms[:n_fits]
+        final_alphas = final_alphas[:n_fits]
+        fwhm_errs = fwhm_errs[:n_fits]
+
         # Make sure fit isn't based on only a few points
         if len(fwhms) < nsteps * 0.2 and early_break is False:
             log.debug("less than 20% fits successful")
             raise RuntimeError
 
-        ids = (fwhm_errs < 2 * np.nanpercentile(fwhm_errs, 50)) & (fwhm_errs > 1e-10)
+        ids = (fwhm_errs < 2 * np.nanmedian(fwhm_errs)) & (fwhm_errs > 1e-10)
         # Fit alpha curve to get best alpha
 
         try:
@@ -326,13 +418,9 @@ def fom_fwhm_with_alpha_fit(
 
             rng = np.random.default_rng(1)
             alpha_pars_b = rng.multivariate_normal(alpha_fit, cov, size=1000)
-            fits = np.array(
-                [
-                    np.polynomial.polynomial.polyval(alphas, pars[::-1])
-                    for pars in alpha_pars_b
-                ]
-            )
-            min_alphas = np.array([alphas[np.nanargmin(fit)] for fit in fits])
+            # evaluate all the bootstrapped polynomials at once, one row per set
+            fits = np.polynomial.polynomial.polyval(alphas, alpha_pars_b[:, ::-1].T)
+            min_alphas = alphas[np.nanargmin(fits, axis=1)]
             alpha_err = np.nanstd(min_alphas)
             if display > 0:
                 plt.figure()
@@ -403,6 +491,22 @@ def fom_fwhm_with_alpha_fit(
         }
 
 
+def _fom_columns(tb_in, parameter, ctc_param=None):
+    """
+    Read the energy and drift time columns used by the FOMs as float arrays.
+    """
+    energies = np.asarray(tb_in[parameter].nda, dtype=np.float64)
+    if ctc_param is not None:
+        try:
+            dt = tb_in[ctc_param].nda
+        except KeyError:
+            dt = tb_in.eval(ctc_param).nda
+        dt = np.asarray(dt, dtype=np.float64)
+    else:
+        dt = 0
+    return energies, dt
+
+
 def fom_fwhm_no_alpha_sweep(
     tb_in,
     kwarg_dict,
@@ -416,30 +520,48 @@ def fom_fwhm_no_alpha_sweep(
     """
     FOM with no ctc sweep, used for optimising ftp.
     """
+    if "ctc_param" in kwarg_dict or ctc_param is not None:
+        ctc_param = kwarg_dict.get("ctc_param", ctc_param)
+    energies, dt = _fom_columns(tb_in, kwarg_dict["parameter"], ctc_param)
+    return _fom_fwhm_no_alpha_sweep_arrays(
+        energies,
+        dt,
+        kwarg_dict,
+        alpha=alpha,
+        idxs=idxs,
+        frac_max=frac_max,
+        kev=kev,
+        display=display,
+    )
+
+
+def _fom_fwhm_no_alpha_sweep_arrays(
+    energies,
+    dt,
+    kwarg_dict,
+    alpha=0,
+    idxs=None,
+    frac_max=0.5,
+    kev=True,
+    display=0,
+):
+    """
+    :func:`fom_fwhm_no_alpha_sweep` on already loaded energy and drift time
+    arrays, so callers fitting several peaks only read the columns once.
+    """
     parameter = kwarg_dict["parameter"]
     func = kwarg_dict["func"]
-    energies = tb_in[parameter].nda
-    energies = energies.astype("float64")
     peak = kwarg_dict["peak"]
     kev_width = kwarg_dict["kev_width"]
     alpha = kwarg_dict.get("alpha", alpha)
     if isinstance(alpha, dict):
         alpha = alpha[parameter]
-    if "ctc_param" in kwarg_dict or ctc_param is not None:
-        ctc_param = kwarg_dict.get("ctc_param", ctc_param)
-        try:
-            dt = tb_in[ctc_param].nda
-        except KeyError:
-            dt = tb_in.eval(ctc_param)
-            dt = tb_in[ctc_param].nda
-    else:
-        dt = 0
 
     if idxs is not None:
         energies = energies[idxs]
         dt = dt[idxs]
 
-    if np.isnan(energies).any():
+    if not np.isfinite(energies.sum()):
         return {
             "fwhm": np.nan,
             "fwhm_o_max": np.nan,
@@ -500,6 +622,7 @@ def fom_single_peak_alpha_sweep(data, kwarg_dict, display=0):
         idxs=idx_list[0],
         frac_max=frac_max,
         display=display,
+        n_processes=kwarg_dict.get("n_processes", 1),
     )
     return out_dict
 
@@ -522,37 +645,41 @@ def fom_interpolate_energy_res_with_single_peak_alpha_sweep(
         idxs=idx_list[-1],
         frac_max=frac_max,
         display=display,
+        n_processes=kwarg_dict.get("n_processes", 1),
     )
     alpha = out_dict["alpha"]
     log.info(alpha)
-    fwhms = []
-    fwhm_errs = []
-    n_sig = []
-    n_sig_err = []
-    for i, _ in enumerate(peaks[:-1]):
-        out_peak_dict = fom_fwhm_no_alpha_sweep(
-            data,
+    n_peaks = len(peaks)
+    fwhms = np.empty(n_peaks)
+    fwhm_errs = np.empty(n_peaks)
+    n_sig = np.empty(n_peaks)
+    n_sig_err = np.empty(n_peaks)
+    # the peaks normally share their columns, only read each pair once
+    columns = {}
+    for i in range(n_peaks - 1):
+        key = (peak_dicts[i]["parameter"], peak_dicts[i].get("ctc_param", ctc_param))
+        if key not in columns:
+            columns[key] = _fom_columns(data, *key)
+        energies, dt = columns[key]
+        out_peak_dict = _fom_fwhm_no_alpha_sweep_arrays(
+            energies,
+            dt,
             peak_dicts[i],
-            ctc_param,
             alpha=alpha,
             idxs=idx_list[i],
             frac_max=frac_max,
             display=display,
         )
-        fwhms.append(out_peak_dict["fwhm"])
-        fwhm_errs.append(out_peak_dict["fwhm_err"])
-        n_sig.append(out_peak_dict["n_sig"])
-        n_sig_err.append(out_peak_dict["n_sig_err"])
-    fwhms.append(out_dict["fwhm"])
-    fwhm_errs.append(out_dict["fwhm_err"])
-    n_sig.append(out_dict["n_sig"])
-    n_sig_err.append(out_dict["n_sig_err"])
+        fwhms[i] = out_peak_dict["fwhm"]
+        fwhm_errs[i] = out_peak_dict["fwhm_err"]
+        n_sig[i] = out_peak_dict["n_sig"]
+        n_sig_err[i] = out_peak_dict["n_sig_err"]
+    fwhms[-1] = out_dict["fwhm"]
+    fwhm_errs[-1] = out_dict["fwhm_err"]
+    n_sig[-1] = out_dict["n_sig"]
+    n_sig_err[-1] = out_dict["n_sig_err"]
     log.info(f"fwhms are {fwhms}keV +- {fwhm_errs}")
 
-    fwhms = np.array(fwhms)
-    fwhm_errs = np.array(fwhm_errs)
-    n_sig = np.array(n_sig)
-    n_sig_err = np.array(n_sig_err)
     peaks = np.array(peaks)
 
     nan_mask = np.isnan(fwhms) | (fwhms < 0)
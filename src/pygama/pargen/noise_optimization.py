@@ -49,7 +49,7 @@ def noise_optimization(
     res_dict : dict
     """
 
-    t0 = time.time()
+    t0 = time.perf_counter()
 
     samples = np.arange(opt_dict["start"], opt_dict["stop"], opt_dict["step"])
     samples_val = np.arange(opt_dict["start"], opt_dict["stop"], opt_dict["step_val"])
@@ -87,9 +87,9 @@ def noise_optimization(
             else:
                 par_dsp[dict_str] = {filter_par: f"{x}*us"}
 
-        t1 = time.time()
+        t1 = time.perf_counter()
         dsp_data = run_one_dsp(tb_data, dsp_proc_chain, db_dict=par_dsp)
-        log.info(f"Time to process dsp data {time.time()-t1:.2f} s")
+        log.info(f"Time to process dsp data {time.perf_counter()-t1:.2f} s")
 
         for ene_par in ene_pars:
             dict_str = opt_dict_par[ene_par]["dict_str"]
@@ -220,7 +220,7 @@ def noise_optimization(
             par_dict_res["optimization"] = fig
             plot_dict["nopt"][dict_str] = par_dict_res
 
-    log.info(f"Time to complete the optimization {time.time()-t0:.2f} s")
+    log.info(f"Time to complete the optimization {time.perf_counter()-t0:.2f} s")
     if display > 0:
         return res_dict, plot_dict
     else:
@@ -3,6 +3,7 @@ import os
 from pathlib import Path
 
 import awkward as ak
+import lgdo
 import numpy as np
 import pytest
 from lgdo import lh5
@@ -234,3 +235,31 @@ def test_vov_input(lgnd_test_data, tmp_dir):
     orig = lh5.read_as("ch1067205/dsp/energies", infile, "ak")
     data = lh5.read_as("ch1067205/hit/a", outfile, "ak")
     assert ak.all(data == orig)
+
+
+def test_n_max(tmp_dir):
+    infile = f"{tmp_dir}/test_n_max_dsp.lh5"
+    outfile = f"{tmp_dir}/test_n_max_hit.lh5"
+
+    lh5.write(
+        lgdo.Table(col_dict={"a": lgdo.Array(np.arange(100, dtype=np.float64))}),
+        "ch0/dsp",
+        infile,
+        wo_mode="overwrite",
+    )
+    hit_config = {"outputs": ["b"], "operations": {"b": {"expression": "2*a"}}}
+
+    build_hit(
+        infile,
+        outfile=outfile,
+        hit_config=hit_config,
+        n_max=42,
+        buffer_len=10,
+        wo_mode="overwrite",
+    )
+    tbl = lh5.read("ch0/hit", outfile)
+    assert len(tbl) == 42
+    assert np.array_equal(tbl.b.nda, 2 * np.arange(42))
+
+    build_hit(infile, outfile=outfile, hit_config=hit_config, wo_mode="overwrite")
+    assert len(lh5.read("ch0/hit", outfile)) == 100
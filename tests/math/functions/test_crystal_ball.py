@@ -77,3 +77,32 @@ def test_required_args():
 
 def test_name():
     assert crystal_ball.name == "crystal_ball"
+
+
+def test_crystalball_tail_and_core():
+    x = np.linspace(-50, 20, 1001)
+    mu = 1
+    sigma = 2
+
+    for beta, m in [(0.5, 1.5), (1, 2), (2, 3), (3.5, 10)]:
+        par_array = [mu, sigma, beta, m]
+        assert np.allclose(
+            crystal_ball.get_pdf(x, *par_array),
+            scipy_crystal_ball.pdf(x, beta, m, mu, sigma),
+            rtol=1e-8,
+        )
+        assert np.allclose(
+            crystal_ball.get_cdf(x, *par_array),
+            scipy_crystal_ball.cdf(x, beta, m, mu, sigma),
+            rtol=1e-8,
+        )
+
+        y_sig, _ = crystal_ball.pdf_ext(x, -5, 3, 20, *par_array)
+        assert np.allclose(
+            y_sig,
+            20 * np.diff(scipy_crystal_ball.cdf([-5, 3], beta, m, mu, sigma))[0],
+            rtol=1e-8,
+        )
+
+        y_sig, _ = crystal_ball.pdf_ext(x, -np.inf, np.inf, 20, *par_array)
+        assert np.allclose(y_sig, 20, rtol=1e-8)
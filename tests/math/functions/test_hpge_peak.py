@@ -1,120 +1,157 @@
+import math
+
 import numpy as np
-from scipy.stats import exponnorm, norm
+import pytest
+from scipy.special import erfc, ndtr
+from scipy.stats import exponnorm
 
 from pygama.math.functions.hpge_peak import hpge_peak
 from pygama.math.functions.sum_dists import SumDists
 
+_SQRT_2_OVER_PI = math.sqrt(2 / math.pi)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2 * math.pi)
 
-def test_hpge_peak_pdf():
-    x = np.arange(-10, 10)
+_X = np.arange(-10, 10, dtype=np.float64)
+_X.setflags(write=False)
 
-    sigma = 0.2
-    mu = 2
-    tau = 0.1
-    htail = 0.75
-    hstep = 0.5
-    x_lo = np.amin(x)
-    x_hi = np.max(x)
-    n_sig = 10
-    n_bkg = 20
 
-    pars = np.array(
-        [x_lo, x_hi, n_sig, mu, sigma, htail, tau, n_bkg, hstep],
-        dtype=float,
-    )
-
-    assert isinstance(hpge_peak, SumDists)
+def _exgauss_tail(z, k):
+    """
+    pdf of a gaussian with a low-side exponential tail times `tau`, in the
+    standardised `z` and with ``k = tau/sigma``. Equal to
+    ``tau * exponnorm.pdf(-x, k, -mu, sigma)``.
+    """
+    return 0.5 * np.exp(0.5 / (k * k) + z / k) * erfc((1 / k + z) / np.sqrt(2))
 
-    y_direct = hpge_peak.get_pdf(x, *pars)
-    scipy_exgauss = htail * exponnorm.pdf(
-        -1 * x, tau / sigma, -1 * mu, sigma
-    )  # to be equivalent to the scipy version, x -> -x, mu -> -mu, k -> k/sigma
-    scipy_gauss = (1 - htail) * norm.pdf(x, mu, sigma)
 
-    scipy_step = 1 + hstep * (norm.cdf(x, mu, sigma) * 2 - 1)
+def _scipy_reference(x, mu, sigma, tau, htail, hstep, n_sig, n_bkg):
+    """scipy reference pdf and cdf of hpge_peak at the points `x`."""
+    # standardised points and their normal CDFs, shared by the terms below
+    # the extremes are appended so a single ndtr call covers all of them
+    z_all = np.empty(len(x) + 2)
+    z = z_all[: len(x)]
+    np.subtract(x, mu, out=z)
+    z /= sigma
+    zmax = z_all[-2] = z.max()
+    zmin = z_all[-1] = z.min()
+    cdf_all = ndtr(z_all)
+    cdf_z = cdf_all[: len(x)]
+    cdf_zmax, cdf_zmin = cdf_all[-2:]
 
-    maximum = (np.amax(x) - mu) / sigma
-    minimum = (np.amin(x) - mu) / sigma
     normalization = sigma * (
         (
-            maximum
-            + hstep * maximum * (norm.cdf(maximum) * 2 - 1)
-            + hstep * np.exp(-1 * maximum**2) / np.sqrt(np.pi)
+            zmax
+            + hstep * zmax * (cdf_zmax * 2 - 1)
+            + hstep * np.exp(-0.5 * zmax * zmax) * _SQRT_2_OVER_PI
         )
         - (
-            minimum
-            + hstep * minimum * (norm.cdf(minimum) * 2 - 1)
-            + hstep * np.exp(-1 * minimum**2) / np.sqrt(np.pi)
+            zmin
+            + hstep * zmin * (cdf_zmin * 2 - 1)
+            + hstep * np.exp(-0.5 * zmin * zmin) * _SQRT_2_OVER_PI
         )
     )
-    scipy_step = scipy_step / normalization
 
-    scipy_y = n_sig * (scipy_exgauss + scipy_gauss) + n_bkg * scipy_step
+    scipy_exgauss_pdf = htail * _exgauss_tail(z, tau / sigma) / tau
+    # scipy's exponnorm as an independent reference for the tail cdf
+    scipy_exgauss_cdf = htail * (1 - exponnorm.cdf(-x, tau / sigma, -mu, sigma))
+    scipy_gauss_pdf = (1 - htail) * np.exp(-0.5 * z * z) * _INV_SQRT_2PI / sigma
+    scipy_gauss_cdf = (1 - htail) * cdf_z
+
+    scipy_step_pdf = (1 + hstep * (cdf_z * 2 - 1)) / normalization
+    scipy_step_cdf = (
+        sigma
+        * (
+            z
+            + hstep * z * (2 * cdf_z - 1)
+            + hstep * np.exp(-0.5 * z * z) * _SQRT_2_OVER_PI
+        )
+        / normalization
+    )
 
-    assert np.allclose(y_direct, scipy_y, rtol=1e-8)
+    scipy_y_pdf = n_sig * (scipy_exgauss_pdf + scipy_gauss_pdf) + n_bkg * scipy_step_pdf
+    scipy_y_cdf = n_sig * (scipy_exgauss_cdf + scipy_gauss_cdf) + n_bkg * (
+        scipy_step_cdf + (1 - scipy_step_cdf[-1])
+    )
+    return scipy_y_pdf, scipy_y_cdf
 
-    y_sig, y_ext = hpge_peak.pdf_ext(x, *pars)
-    assert np.allclose(y_ext, scipy_y, rtol=1e-8)
-    assert np.allclose(y_sig, n_sig + n_bkg, rtol=1e-8)
 
+# (mu, sigma, tau, htail, hstep), all with the peak well inside the range of x
+_SHAPE_PARS = [
+    (2, 0.2, 0.1, 0.75, 0.5),
+    (0, 1, 0.3, 0.5, 0.2),
+    (-3, 0.5, 0.4, 0.2, 0.05),
+    (5, 0.5, 0.2, 0.9, 0.0),
+]
 
-def test_hpge_peak_cdf():
-    x = np.arange(-10, 10)
 
-    sigma = 0.2
-    mu = 2
-    tau = 0.1
-    htail = 0.75
-    hstep = 0.5
+@pytest.fixture(scope="module", params=_SHAPE_PARS)
+def hpge_ref(request):
+    """Parameters and the scipy reference terms shared by the pdf and cdf tests."""
+    x = _X
+
+    mu, sigma, tau, htail, hstep = request.param
     x_lo = np.amin(x)
     x_hi = np.max(x)
     n_sig = 10
     n_bkg = 20
 
-    pars = np.array(
-        [x_lo, x_hi, n_sig, mu, sigma, htail, tau, n_bkg, hstep],
-        dtype=float,
+    pars = np.empty(9, dtype=np.float64)
+    pars[:] = (x_lo, x_hi, n_sig, mu, sigma, htail, tau, n_bkg, hstep)
+
+    scipy_y_pdf, scipy_y_cdf = _scipy_reference(
+        x, mu, sigma, tau, htail, hstep, n_sig, n_bkg
     )
 
-    assert isinstance(hpge_peak, SumDists)
+    return {
+        "x": x,
+        "pars": pars,
+        "n_sig": n_sig,
+        "n_bkg": n_bkg,
+        "scipy_y_pdf": scipy_y_pdf,
+        "scipy_y_cdf": scipy_y_cdf,
+    }
 
-    y_direct = hpge_peak.get_cdf(x, *pars)
 
-    scipy_exgauss = htail * (
-        1 - exponnorm.cdf(-1 * x, tau / sigma, -1 * mu, sigma)
-    )  # to be equivalent to the scipy version, x -> -x, mu -> -mu, k -> k/sigma
-    scipy_gauss = (1 - htail) * norm.cdf(x, mu, sigma)
+def test_hpge_peak_pdf(hpge_ref):
+    x = hpge_ref["x"]
+    pars = hpge_ref["pars"]
+    scipy_y = hpge_ref["scipy_y_pdf"]
 
-    z = (x - mu) / sigma
-    scipy_step = sigma * (
-        z
-        + hstep * z * (2 * norm.cdf(z, 0, 1) - 1)
-        + hstep * np.exp(-1 * z**2) / np.sqrt(np.pi)
-    )
-    maximum = (np.amax(x) - mu) / sigma
-    minimum = (np.amin(x) - mu) / sigma
-    normalization = sigma * (
-        (
-            maximum
-            + hstep * maximum * (norm.cdf(maximum) * 2 - 1)
-            + hstep * np.exp(-1 * maximum**2) / np.sqrt(np.pi)
-        )
-        - (
-            minimum
-            + hstep * minimum * (norm.cdf(minimum) * 2 - 1)
-            + hstep * np.exp(-1 * minimum**2) / np.sqrt(np.pi)
-        )
+    assert isinstance(hpge_peak, SumDists)
+
+    y_direct = hpge_peak.get_pdf(x, *pars)
+    np.testing.assert_allclose(y_direct, scipy_y, rtol=1e-8, atol=1e-8)
+
+    y_sig, y_ext = hpge_peak.pdf_ext(x, *pars)
+    np.testing.assert_allclose(y_ext, scipy_y, rtol=1e-8, atol=1e-8)
+    np.testing.assert_allclose(
+        y_sig, hpge_ref["n_sig"] + hpge_ref["n_bkg"], rtol=1e-8, atol=1e-8
     )
 
-    scipy_step /= normalization
-    scipy_hstep = scipy_step + (1 - scipy_step[-1])
 
-    scipy_y = n_sig * (scipy_exgauss + scipy_gauss) + n_bkg * scipy_hstep
+def test_hpge_peak_cdf(hpge_ref):
+    x = hpge_ref["x"]
+    pars = hpge_ref["pars"]
+    scipy_y = hpge_ref["scipy_y_cdf"]
+
+    assert isinstance(hpge_peak, SumDists)
 
-    assert np.allclose(y_direct, scipy_y, rtol=1e-1)
+    y_direct = hpge_peak.get_cdf(x, *pars)
+    np.testing.assert_allclose(y_direct, scipy_y, rtol=1e-8, atol=1e-8)
 
     y_ext = hpge_peak.cdf_ext(x, *pars)
-    assert np.allclose(y_ext, scipy_y, rtol=1e-1)
+    np.testing.assert_allclose(y_ext, scipy_y, rtol=1e-8, atol=1e-8)
+
+
+@pytest.mark.parametrize("mu, sigma, tau", [shape[:3] for shape in _SHAPE_PARS])
+def test_exgauss_tail_matches_scipy(mu, sigma, tau):
+    z = (_X - mu) / sigma
+    np.testing.assert_allclose(
+        _exgauss_tail(z, tau / sigma) / tau,
+        exponnorm.pdf(-_X, tau / sigma, -mu, sigma),
+        rtol=1e-8,
+        atol=1e-8,
+    )
 
 
 def test_required_args():
@@ -1,7 +1,9 @@
 import numpy as np
 from pytest import approx
 
-from pygama.math.functions.hpge_peak import hpge_peak
+from pygama.math.distributions import exgauss, gauss_on_exgauss
+from pygama.math.functions.hpge_peak import hpge_get_fwfm, hpge_peak
+from pygama.math.functions.sum_dists import SumDists
 
 lower_range, upper_range, n_sig, mu, sigma, frac1, tau, n_bkg, hstep = range(9)
 pars = [np.inf, np.inf, 1, 0, 1, 0, 0.1, 0, 0]
@@ -31,6 +33,42 @@ def test_get_fwhm():
     assert dfwhm == approx(2.3548e-1, rel=1e-5)
 
 
+def test_get_fwfm_without_step():
+    # a tailed peak without hstep, so the gaussian width is used and must honour
+    # frac_max
+    x_lo, x_hi, n_sig, mu, sigma, htail, tau, n_bkg, tau_bkg = range(9)
+    peak_without_step = SumDists(
+        [
+            (gauss_on_exgauss, [mu, sigma, htail, tau]),
+            (exgauss, [mu, sigma, tau_bkg]),
+        ],
+        [n_sig, n_bkg],
+        "areas",
+        parameter_names=[
+            "x_lo",
+            "x_hi",
+            "n_sig",
+            "mu",
+            "sigma",
+            "htail",
+            "tau_sig",
+            "n_bkg",
+            "tau",
+        ],
+        name="peak_without_step",
+    )
+    peak_without_step.get_fwfm = hpge_get_fwfm.__get__(peak_without_step)
+
+    peak_pars = [np.inf, np.inf, 1, 0, 1, 0.1, 0.1, 0, 1]
+    fwtm = peak_without_step.get_fwfm(peak_pars, frac_max=0.1)
+    _, dfwtm = peak_without_step.get_fwfm(
+        peak_pars, frac_max=0.1, cov=np.diag([0, 0, 0, 0, 1e-2, 0, 0, 0, 0])
+    )
+
+    assert fwtm == approx(2 * np.sqrt(2 * np.log(10)))
+    assert dfwtm == approx(0.2 * np.sqrt(2 * np.log(10)))
+
+
 def test_get_total_events():
     total_events, total_event_err = hpge_peak.get_total_events(pars, cov)
 
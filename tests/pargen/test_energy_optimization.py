@@ -1,6 +1,9 @@
+import numpy as np
 import scipy
+from lgdo import Array, Table
 
-from pygama.pargen import energy_optimisation  # noqa: F401
+import pygama.math.distributions as pgd
+from pygama.pargen import energy_optimisation
 
 
 def test_import():
@@ -10,3 +13,28 @@ def test_import():
 def test_scipy_version():
     assert scipy.__version__ != ""
     assert scipy.__version__ is not None
+
+
+def test_alpha_sweep_parallel_matches_serial():
+    rng = np.random.default_rng(42)
+    n = 20000
+    dt = rng.uniform(200, 1000, n)
+    energies = np.concatenate(
+        [rng.normal(2614.5, 1.2, n // 2), rng.uniform(2550, 2680, n - n // 2)]
+    ) / (1 + 1.5e-6 * dt)
+    tb = Table(col_dict={"e": Array(energies), "dt": Array(dt)})
+    kwarg_dict = {
+        "parameter": "e",
+        "func": pgd.hpge_peak,
+        "peak": 2614.5,
+        "kev_width": (40, 40),
+    }
+
+    serial = energy_optimisation.fom_fwhm_with_alpha_fit(tb, kwarg_dict, "dt", nsteps=7)
+    parallel = energy_optimisation.fom_fwhm_with_alpha_fit(
+        tb, kwarg_dict, "dt", nsteps=7, n_processes=2
+    )
+    assert np.isfinite(serial["fwhm"])
+    assert serial.keys() == parallel.keys()
+    for key, value in serial.items():
+        assert np.array_equal(value, parallel[key], equal_nan=True), key